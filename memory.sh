@@ -65,6 +65,11 @@ case "$1" in
     python3 "$SCRIPT_DIR/memory_client.py" count
     ;;
 
+  init)
+    # Enable int8 quantization and create payload indexes on the collection
+    python3 "$SCRIPT_DIR/memory_client.py" init
+    ;;
+
   ingest)
     # Ingest conversation with context metadata
     # Usage: memory.sh ingest --project "project-A" --platform "telegram" --stakeholder "client-X"
@@ -144,6 +149,7 @@ asyncio.run(run())
     echo "  import <file>            Import MEMORY.md to vector store"
     echo "  sync                     Bidirectional sync with MEMORY.md"
     echo "  count                    Count total memories"
+    echo "  init                     Enable int8 quantization (rebuilds index) + payload indexes"
     echo "  ingest                   Ingest conversations with metadata"
     echo "  hybrid <query>           Hybrid dense+keyword search"
     echo "  consolidate              Run M1 consolidation (episodic→semantic facts)"
@@ -3,7 +3,6 @@
 Benchmark: Compare vector memory search vs markdown-based search.
 """
 
-import asyncio
 import argparse
 import os
 import re
@@ -13,7 +12,9 @@ from typing import Optional
 
 # Add parent dir for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from memory_client import MemoryClient
+from memory_client import MemoryClient, run_async
+
+_WORD_RE = re.compile(r'\w+')
 
 
 def markdown_search(filepath: str, query: str, limit: int = 5) -> list[dict]:
@@ -23,30 +24,35 @@ def markdown_search(filepath: str, query: str, limit: int = 5) -> list[dict]:
     
     # Split into sections
     sections = []
-    current = {"header": "", "content": ""}
+    current_header = ""
+    current_lines: list[str] = []
     
-    for line in content.split("\n"):
+    for line in content.splitlines():
         if line.startswith("## "):
-            if current["content"].strip():
-                sections.append(current)
-            current = {"header": line[3:].strip(), "content": ""}
+            text = "\n".join(current_lines)
+            if text.strip():
+                sections.append({"header": current_header, "content": text})
+            current_header = line[3:].strip()
+            current_lines = []
         else:
-            current["content"] += line + "\n"
+            current_lines.append(line)
     
-    if current["content"].strip():
-        sections.append(current)
+    text = "\n".join(current_lines)
+    if text.strip():
+        sections.append({"header": current_header, "content": text})
     
     # Score by keyword overlap
-    query_words = set(query.lower().split())
+    query_words = frozenset(query.lower().split())
+    inv_query_len = 1.0 / len(query_words) if query_words else 0.0
     scored = []
     
     for section in sections:
         text = (section["header"] + " " + section["content"]).lower()
-        text_words = set(re.findall(r'\w+', text))
-        overlap = len(query_words & text_words)
+        text_words = set(_WORD_RE.findall(text))
+        overlap = sum(1 for w in query_words if w in text_words)
         if overlap > 0:
             scored.append({
-                "score": overlap / len(query_words),
+                "score": overlap * inv_query_len,
                 "content": section["content"].strip()[:200],
                 "header": section["header"],
                 "method": "markdown-keyword"
@@ -137,7 +143,7 @@ def main():
     parser.add_argument("--limit", type=int, default=5)
     
     args = parser.parse_args()
-    asyncio.run(benchmark(args.query, args.markdown, args.limit))
+    run_async(benchmark(args.query, args.markdown, args.limit))
 
 
 if __name__ == "__main__":
@@ -4,7 +4,6 @@ Auto-ingest conversation turns into memory.
 Can be called after each conversation turn or batch process transcripts.
 """
 
-import asyncio
 import argparse
 import json
 import os
@@ -14,7 +13,18 @@ from datetime import datetime
 from typing import Optional
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from memory_client import MemoryClient
+from memory_client import MemoryClient, run_async
+
+_MENTION_RE = re.compile(r'@(\w+)')
+_URL_RE = re.compile(r'https?://([^\s/]+)')
+_CODE_RE = re.compile(r'\b([a-z]+_[a-z_]+|[A-Z][a-z]+[A-Z][a-zA-Z]*)\b')
+
+# Common keywords tagged as entities whenever they appear
+_ENTITY_KEYWORDS = ('coolify', 'docker', 'github', 'memory', 'skill', 'ollama', 'qdrant')
+_KEYWORD_RE = re.compile('|'.join(map(re.escape, _ENTITY_KEYWORDS)))
+
+_PREFERENCE_WORDS = ('prefer', 'want', 'need', 'important', 'remember')
+_ACTION_WORDS = ('created', 'installed', 'configured', 'deployed')
 
 
 def extract_entities(text: str) -> list[str]:
@@ -22,22 +32,19 @@ def extract_entities(text: str) -> list[str]:
     entities = []
     
     # Extract @mentions
-    mentions = re.findall(r'@(\w+)', text)
+    mentions = _MENTION_RE.findall(text)
     entities.extend(mentions)
     
     # Extract URLs/domains
-    domains = re.findall(r'https?://([^\s/]+)', text)
+    domains = _URL_RE.findall(text)
     entities.extend(domains)
     
     # Extract code-like terms (function_names, CamelCase)
-    code_terms = re.findall(r'\b([a-z]+_[a-z_]+|[A-Z][a-z]+[A-Z][a-zA-Z]*)\b', text)
+    code_terms = _CODE_RE.findall(text)
     entities.extend(code_terms[:5])  # Limit
     
-    # Common keywords
-    keywords = ['coolify', 'docker', 'github', 'memory', 'skill', 'ollama', 'qdrant']
-    for kw in keywords:
-        if kw in text.lower():
-            entities.append(kw)
+    # Common keywords, found in one scan of the lowercased text
+    entities.extend(set(_KEYWORD_RE.findall(text.lower())))
     
     return list(set(entities))[:10]
 
@@ -45,16 +52,17 @@ def extract_entities(text: str) -> list[str]:
 def calculate_importance(text: str, role: str) -> float:
     """Estimate importance of a message."""
     importance = 0.5
+    lowered = text.lower()
     
     # User messages about preferences/decisions are important
     if role == "user":
         importance += 0.1
-        if any(w in text.lower() for w in ['prefer', 'want', 'need', 'important', 'remember']):
+        if any(w in lowered for w in _PREFERENCE_WORDS):
             importance += 0.2
     
     # Assistant messages with decisions/actions
     if role == "assistant":
-        if any(w in text.lower() for w in ['created', 'installed', 'configured', 'deployed']):
+        if any(w in lowered for w in _ACTION_WORDS):
             importance += 0.15
     
     # Longer messages often more substantive
@@ -65,6 +73,68 @@ def calculate_importance(text: str, role: str) -> float:
     return min(importance, 1.0)
 
 
+def turn_memory(
+    content: str,
+    role: str = "user",
+    session_id: Optional[str] = None,
+) -> Optional[dict]:
+    """Build the memory fields for a conversation turn (None if too short)."""
+    # Skip very short messages
+    if len(content) < 20:
+        return None
+    
+    return {
+        "content": f"[{role}] {content}",
+        "memory_type": "episodic",
+        "importance": calculate_importance(content, role),
+        "entities": extract_entities(content),
+        "session_id": session_id,
+        "metadata": {"role": role, "ingested_at": datetime.utcnow().isoformat()},
+    }
+
+
+def parse_transcript(content: str) -> list[tuple[str, str]]:
+    """Parse a transcript (JSON list or `role: message` lines) into (role, text) turns."""
+    # Try JSON format first
+    try:
+        data = json.loads(content)
+        if isinstance(data, list):
+            turns = []
+            for turn in data:
+                role = turn.get("role", "user")
+                text = turn.get("content", "")
+                if text:
+                    turns.append((role, text))
+            return turns
+    except json.JSONDecodeError:
+        pass
+    
+    # Try simple text format (role: message)
+    turns = []
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        
+        role = "user"
+        text = line
+        
+        if line.lower().startswith("user:"):
+            role = "user"
+            text = line[5:].strip()
+        elif line.lower().startswith("assistant:"):
+            role = "assistant"
+            text = line[10:].strip()
+        elif line.lower().startswith("m2:"):
+            role = "assistant"
+            text = line[3:].strip()
+        
+        if text:
+            turns.append((role, text))
+    
+    return turns
+
+
 async def ingest_turn(
     content: str,
     role: str = "user",
@@ -72,6 +142,10 @@ async def ingest_turn(
     client: Optional[MemoryClient] = None,
 ) -> str:
     """Ingest a single conversation turn."""
+    memory = turn_memory(content, role, session_id)
+    if memory is None:
+        return None
+    
     close_client = False
     if client is None:
         client = MemoryClient()
@@ -79,22 +153,7 @@ async def ingest_turn(
         close_client = True
     
     try:
-        entities = extract_entities(content)
-        importance = calculate_importance(content, role)
-        
-        # Skip very short messages
-        if len(content) < 20:
-            return None
-        
-        memory_id = await client.store(
-            content=f"[{role}] {content}",
-            memory_type="episodic",
-            importance=importance,
-            entities=entities,
-            session_id=session_id,
-            metadata={"role": role, "ingested_at": datetime.utcnow().isoformat()}
-        )
-        return memory_id
+        return await client.store(**memory)
     finally:
         if close_client:
             await client.__aexit__(None, None, None)
@@ -105,48 +164,18 @@ async def ingest_transcript(filepath: str, session_id: Optional[str] = None) ->
     with open(filepath) as f:
         content = f.read()
     
-    count = 0
+    memories = [
+        memory
+        for role, text in parse_transcript(content)
+        if (memory := turn_memory(text, role, session_id)) is not None
+    ]
+    if not memories:
+        return 0
+    
     async with MemoryClient() as client:
-        # Try JSON format first
-        try:
-            data = json.loads(content)
-            if isinstance(data, list):
-                for turn in data:
-                    role = turn.get("role", "user")
-                    text = turn.get("content", "")
-                    if text:
-                        mid = await ingest_turn(text, role, session_id, client)
-                        if mid:
-                            count += 1
-                return count
-        except json.JSONDecodeError:
-            pass
-        
-        # Try simple text format (role: message)
-        for line in content.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            
-            role = "user"
-            text = line
-            
-            if line.lower().startswith("user:"):
-                role = "user"
-                text = line[5:].strip()
-            elif line.lower().startswith("assistant:"):
-                role = "assistant"
-                text = line[10:].strip()
-            elif line.lower().startswith("m2:"):
-                role = "assistant"
-                text = line[3:].strip()
-            
-            if text:
-                mid = await ingest_turn(text, role, session_id, client)
-                if mid:
-                    count += 1
-    
-    return count
+        await client.store_many(memories)
+    
+    return len(memories)
 
 
 async def main():
@@ -179,4 +208,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
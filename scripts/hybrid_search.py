@@ -4,36 +4,88 @@ Hybrid search combining vector similarity + keyword matching.
 Useful when sparse embeddings aren't available.
 """
 
-import asyncio
 import argparse
+import asyncio
 import os
 import re
 import sys
+from functools import lru_cache
 from typing import Optional
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from memory_client import MemoryClient, QDRANT_URL, COLLECTION_NAME, DEFAULT_AGENT_ID
+from memory_client import (
+    MemoryClient,
+    QDRANT_URL,
+    COLLECTION_NAME,
+    DEFAULT_AGENT_ID,
+    json_loads,
+    run_async,
+)
+
+import numpy as np  # installed on demand by memory_client
+
+
+# Upper bound on candidates fetched per keyword-only search term (and for the
+# unindexed fallback scan), and on candidate scrolls running at once
+KEYWORD_CANDIDATE_LIMIT = int(os.getenv("KEYWORD_CANDIDATE_LIMIT", "1000"))
+KEYWORD_SCROLL_CONCURRENCY = int(os.getenv("KEYWORD_SCROLL_CONCURRENCY", "4"))
 
-try:
-    import aiohttp
-except ImportError:
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "aiohttp", "-q"])
-    import aiohttp
+# Too common to select keyword-only candidates on their own
+_STOPWORDS = frozenset("""
+a about an and are as at be but by can could did do does for from had has
+have how i if in into is it its me my no not of on or our should so that the
+their them then there these they this to was we were what when where which
+who why will with would you your
+""".split())
+
+# These run over every stored memory, so they must stay linear-time on hostile
+# input. None can backtrack catastrophically: _HEX_RE has no trailing
+# assertion, and a failed _UPPER_RE attempt means the rest of its run holds no
+# word boundary, so the next viable start lies past it. Keep new patterns to
+# single-quantifier runs like these (no nested or adjacent overlapping repeats).
+_WORD_RE = re.compile(r'\b\w+\b')
+_UPPER_RE = re.compile(r'\b[A-Z0-9][A-Za-z0-9_-]+\b')
+_HEX_RE = re.compile(r'0x[0-9A-Fa-f]+')
 
 
 def extract_keywords(text: str) -> set[str]:
     """Extract searchable keywords from text."""
     # Lowercase and extract words
-    words = set(re.findall(r'\b\w+\b', text.lower()))
+    keywords = set(_WORD_RE.findall(text.lower()))
     
     # Also keep original case for error codes, IDs, etc.
-    originals = set(re.findall(r'\b[A-Z0-9][A-Za-z0-9_-]+\b', text))
+    keywords.update(_UPPER_RE.findall(text))
     
     # Keep hex patterns (error codes)
-    hex_patterns = set(re.findall(r'0x[0-9A-Fa-f]+', text))
+    keywords.update(_HEX_RE.findall(text))
     
-    return words | originals | hex_patterns
+    return keywords
+
+
+@lru_cache(maxsize=4096)
+def content_keywords(text: str) -> frozenset[str]:
+    """Keywords of a stored memory, memoized since the same memories rerank repeatedly."""
+    return frozenset(extract_keywords(text))
+
+
+def count_common(a: frozenset[str], b: frozenset[str]) -> int:
+    """Size of a & b without building the intersection set."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(1 for w in a if w in b)
+
+
+def keyword_scores(query_keywords: set[str], contents: list[str]) -> np.ndarray:
+    """Fraction of query keywords present in each content, as one array."""
+    if not query_keywords:
+        return np.zeros(len(contents))
+    query = frozenset(query_keywords)
+    overlaps = np.fromiter(
+        (count_common(query, content_keywords(c)) for c in contents),
+        dtype=np.float64,
+        count=len(contents),
+    )
+    return overlaps * (1.0 / len(query))
 
 
 async def hybrid_search(
@@ -57,34 +109,70 @@ async def hybrid_search(
     query_keywords = extract_keywords(query)
     
     # Rerank with keyword overlap
-    scored_results = []
-    for r in dense_results:
-        content_keywords = extract_keywords(r["content"])
-        
-        # Calculate keyword overlap score
-        if query_keywords:
-            overlap = len(query_keywords & content_keywords)
-            keyword_score = overlap / len(query_keywords)
-        else:
-            keyword_score = 0
-        
-        # Combine scores
-        combined_score = (
-            dense_weight * r["score"] +
-            keyword_weight * keyword_score
-        )
-        
-        scored_results.append({
-            **r,
-            "dense_score": r["score"],
-            "keyword_score": keyword_score,
-            "combined_score": combined_score,
-        })
+    kw_scores = keyword_scores(query_keywords, [r["content"] for r in dense_results])
+    dense_scores = np.fromiter(
+        (r["score"] for r in dense_results), dtype=np.float64, count=len(dense_results)
+    )
+    combined = dense_weight * dense_scores + keyword_weight * kw_scores
     
-    # Sort by combined score
-    scored_results.sort(key=lambda x: x["combined_score"], reverse=True)
+    # Select the top `limit` in O(n), then order just that slice
+    top = np.arange(len(combined))
+    if len(combined) > limit:
+        top = np.argpartition(-combined, limit)[:limit]
+    top = top[np.argsort(-combined[top], kind="stable")]
     
-    return scored_results[:limit]
+    return [
+        {
+            **dense_results[i],
+            "dense_score": dense_results[i]["score"],
+            "keyword_score": float(kw_scores[i]),
+            "combined_score": float(combined[i]),
+        }
+        for i in top.tolist()
+    ]
+
+
+async def _has_text_index(client: MemoryClient) -> bool:
+    """Whether `content` has the full-text index created by `init`."""
+    async with client.session.get(
+        f"{QDRANT_URL}/collections/{COLLECTION_NAME}"
+    ) as resp:
+        resp.raise_for_status()
+        data = json_loads(await resp.read())
+    schema = data.get("result", {}).get("payload_schema", {})
+    return schema.get("content", {}).get("data_type") == "text"
+
+
+async def _scroll_points(
+    client: MemoryClient,
+    scroll_filter: dict,
+    cap: int,
+) -> list[dict]:
+    """Scroll points matching a filter (ranking fields only), up to `cap`."""
+    points = []
+    offset = None
+    while len(points) < cap:
+        body = {
+            "filter": scroll_filter,
+            "limit": min(256, cap - len(points)),
+            "with_payload": ["content", "memory_type", "importance"],
+        }
+        if offset is not None:
+            body["offset"] = offset
+        async with client.session.post(
+            f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points/scroll",
+            json=body,
+            headers={"Content-Type": "application/json"}
+        ) as resp:
+            resp.raise_for_status()
+            data = json_loads(await resp.read())
+        
+        result = data.get("result", {})
+        points.extend(result.get("points", []))
+        offset = result.get("next_page_offset")
+        if offset is None:
+            break
+    return points
 
 
 async def keyword_only_search(
@@ -94,43 +182,67 @@ async def keyword_only_search(
 ) -> list[dict]:
     """
     Search using only keyword matching (for exact terms like error codes).
-    Falls back to scrolling through all memories.
+    With the `content` full-text index, Qdrant selects candidates: points
+    holding every query term, plus each informative term's matches fetched
+    separately so a rare term is never crowded out by common ones. Without
+    the index, up to KEYWORD_CANDIDATE_LIMIT of the agent's memories are
+    scanned. Candidates are then ranked by keyword overlap.
     """
     query_keywords = extract_keywords(query)
+    if not query_keywords:
+        return []
     
-    async with aiohttp.ClientSession() as session:
-        # Scroll through all memories for this agent
-        async with session.post(
-            f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points/scroll",
-            json={
-                "filter": {
-                    "must": [{"key": "agent_id", "match": {"value": agent_id}}]
-                },
-                "limit": 100,  # Adjust based on expected corpus size
-                "with_payload": True,
-            },
-            headers={"Content-Type": "application/json"}
-        ) as resp:
-            data = await resp.json()
+    agent_match = {"key": "agent_id", "match": {"value": agent_id}}
     
-    results = []
-    for point in data.get("result", {}).get("points", []):
-        content = point["payload"].get("content", "")
-        content_keywords = extract_keywords(content)
-        
-        if query_keywords:
-            overlap = len(query_keywords & content_keywords)
-            if overlap > 0:
-                results.append({
-                    "content": content,
-                    "memory_type": point["payload"].get("memory_type"),
-                    "importance": point["payload"].get("importance"),
-                    "keyword_score": overlap / len(query_keywords),
-                    "matched_keywords": list(query_keywords & content_keywords),
-                })
+    # No embeddings involved, so skip opening the embedding cache
+    async with MemoryClient(agent_id, use_cache=False) as client:
+        if await _has_text_index(client):
+            # The index is lowercased, so case variants are one term
+            lowered = {kw.lower() for kw in query_keywords}
+            terms = sorted(
+                kw for kw in lowered if len(kw) > 2 and kw not in _STOPWORDS
+            ) or sorted(lowered)
+            slots = asyncio.Semaphore(KEYWORD_SCROLL_CONCURRENCY)
+            
+            async def scroll(text: str) -> list[dict]:
+                async with slots:
+                    return await _scroll_points(
+                        client,
+                        {"must": [agent_match, {"key": "content", "match": {"text": text}}]},
+                        KEYWORD_CANDIDATE_LIMIT,
+                    )
+            
+            batches = await asyncio.gather(*(scroll(text) for text in [query, *terms]))
+        else:
+            # Unindexed text matching is a case-sensitive substring test, which
+            # would miss "Docker" for "docker"; rank a bounded scan client-side
+            batches = [await _scroll_points(
+                client, {"must": [agent_match]}, KEYWORD_CANDIDATE_LIMIT
+            )]
+    
+    unique = {}
+    for batch in batches:
+        for point in batch:
+            unique.setdefault(point["id"], point)
+    points = list(unique.values())
+    
+    contents = [point["payload"].get("content", "") for point in points]
+    scores = keyword_scores(query_keywords, contents)
+    
+    # Only the top `limit` matches are materialized as result dicts
+    hits = np.flatnonzero(scores)
+    top = hits[np.argsort(-scores[hits], kind="stable")[:limit]]
     
-    results.sort(key=lambda x: x["keyword_score"], reverse=True)
-    return results[:limit]
+    return [
+        {
+            "content": contents[i],
+            "memory_type": points[i]["payload"].get("memory_type"),
+            "importance": points[i]["payload"].get("importance"),
+            "keyword_score": float(scores[i]),
+            "matched_keywords": list(query_keywords & content_keywords(contents[i])),
+        }
+        for i in top.tolist()
+    ]
 
 
 async def main():
@@ -163,4 +275,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
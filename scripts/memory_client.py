@@ -5,12 +5,16 @@ M2 Memory Client - Vector-based semantic memory using Qdrant + BGE-M3.
 
 import asyncio
 import argparse
+import hashlib
 import json
 import os
+import sqlite3
 import sys
+import time
+from array import array
 from datetime import datetime, timedelta
 from typing import Optional
-from uuid import uuid4
+from uuid import UUID, uuid5
 
 try:
     import aiohttp
@@ -20,53 +24,244 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "aiohttp", "-q"])
     import aiohttp
 
+try:
+    import numpy as np
+except ImportError:
+    print("Installing numpy...")
+    import subprocess
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "numpy", "-q"])
+    import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 QDRANT_URL = os.getenv("QDRANT_URL", "http://memory-qdrant:6333")
 EMBEDDINGS_URL = os.getenv("EMBEDDINGS_URL", "http://memory-embeddings:8000")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "agent_memory")
 DEFAULT_AGENT_ID = os.getenv("AGENT_ID", "m2")
+# Namespace for content-derived memory IDs (uuid5 of the repo URL)
+MEMORY_ID_NAMESPACE = UUID("aa684b0d-9180-5f88-8f52-2a505a4b0ddc")
+# Keep-alive connections shared by all requests of a client
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "64"))
+EMBED_CACHE_PATH = os.getenv(
+    "EMBED_CACHE_PATH", os.path.expanduser("~/.cache/m2-memory/embeddings.db")
+)
+# Time of this machine's last write to the store; on-disk result caches
+# (memory_sync's export cache) drop entries older than it
+WRITE_STAMP_PATH = os.getenv(
+    "WRITE_STAMP_PATH", os.path.expanduser("~/.cache/m2-memory/last_write")
+)
+# Semantic query cache: reuse results of a recent query whose embedding is this similar
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+# Search over the int8-quantized vectors, rescoring an oversampled candidate set
+# with the original vectors (ignored if the collection is not quantized)
+SEARCH_PARAMS = {"quantization": {"rescore": True, "oversampling": 2.0}}
+# Payload indexes created by init_collection(): every query filters on agent_id,
+# and search/recent/entity lookups add memory_type, importance, timestamp or entities.
+# Timestamps stay ISO-8601 strings, which Qdrant's datetime index range-filters.
+PAYLOAD_INDEXES = {
+    "agent_id": "keyword",
+    "memory_type": "keyword",
+    "entities": "keyword",
+    "importance": "float",
+    "timestamp": "datetime",
+    "content": {"type": "text", "tokenizer": "word", "lowercase": True},
+}
+# store_many(): memories per embedding/upsert request, concurrent embedding
+# requests, and embedded batches buffered ahead of the writer
+STORE_BATCH_SIZE = int(os.getenv("STORE_BATCH_SIZE", "64"))
+STORE_CONCURRENCY = int(os.getenv("STORE_CONCURRENCY", "8"))
+STORE_PIPELINE_DEPTH = int(os.getenv("STORE_PIPELINE_DEPTH", "16"))
+
+
+def content_key(text: str) -> str:
+    """Stable content hash used to key cached embeddings."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def json_dumps(obj) -> str:
+    """Serialize request bodies (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def json_loads(data: bytes):
+    """Parse response bodies (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def record_write() -> None:
+    """Stamp the current time as the last write to the store (best effort)."""
+    try:
+        os.makedirs(os.path.dirname(WRITE_STAMP_PATH), exist_ok=True)
+        with open(WRITE_STAMP_PATH, "w") as f:
+            f.write(repr(time.time()))
+    except OSError:
+        pass
+
+
+def last_write_time() -> float:
+    """Time stamped by record_write(), or 0 if nothing was written yet."""
+    try:
+        with open(WRITE_STAMP_PATH) as f:
+            return float(f.read())
+    except (OSError, ValueError):
+        return 0.0
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    
+    if uvloop is None:
+        return asyncio.run(coro)
+    if hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
+
+class EmbeddingCache:
+    """SQLite-backed cache of embedding vectors keyed by content hash."""
+    
+    # Stay below SQLite's default host-parameter limit
+    _QUERY_CHUNK = 500
+    
+    def __init__(self, path: str = EMBED_CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+    
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return cached vectors for the keys that are present."""
+        found = {}
+        for i in range(0, len(keys), self._QUERY_CHUNK):
+            chunk = keys[i:i + self._QUERY_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+        return found
+    
+    def put_many(self, vectors: dict[str, list[float]]) -> None:
+        """Store vectors (as float32) under their content keys."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(key, array("f", vector).tobytes()) for key, vector in vectors.items()],
+        )
+        self.conn.commit()
+    
+    def close(self) -> None:
+        self.conn.close()
 
 
 class MemoryClient:
     """Async client for agent memory operations."""
     
-    def __init__(self, agent_id: str = DEFAULT_AGENT_ID):
+    def __init__(self, agent_id: str = DEFAULT_AGENT_ID, use_cache: bool = True):
         self.agent_id = agent_id
+        self.use_cache = use_cache
         self.session: Optional[aiohttp.ClientSession] = None
+        self.cache: Optional[EmbeddingCache] = None
+        # filter key -> {"vectors": [...], "results": [...], "matrix": stacked vectors or None}
+        self._qcache: dict[tuple, dict] = {}
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            ),
+            json_serialize=json_dumps,
+        )
+        if self.use_cache:
+            try:
+                self.cache = EmbeddingCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Embedding cache disabled: {e}", file=sys.stderr)
         return self
     
     async def __aexit__(self, *args):
         if self.session:
             await self.session.close()
+        if self.cache:
+            self.cache.close()
     
     async def _embed(self, text: str) -> list[float]:
         """Get embedding vector for text."""
+        return (await self._embed_many([text]))[0]
+    
+    async def _embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Get embedding vectors for several texts, serving repeats from the cache."""
+        if not texts:
+            return []
+        if self.cache is None:
+            return await self._fetch_embeddings(texts)
+        
+        keys = [content_key(text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys)))
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        
+        if missing:
+            fetched = dict(zip(missing, await self._fetch_embeddings(list(missing.values()))))
+            self.cache.put_many(fetched)
+            vectors.update(fetched)
+        
+        return [vectors[key] for key in keys]
+    
+    async def _fetch_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Get embedding vectors for several texts in one request."""
         async with self.session.post(
             f"{EMBEDDINGS_URL}/embed",
-            json={"inputs": text},
+            json={"inputs": texts},
             headers={"Content-Type": "application/json"}
         ) as resp:
-            data = await resp.json()
-            return data[0]
+            resp.raise_for_status()
+            vectors = json_loads(await resp.read())
+        # A server that rejects or truncates a batch must not yield bogus points
+        if not isinstance(vectors, list) or len(vectors) != len(texts):
+            raise ValueError(
+                f"Embedding server did not return one vector per input ({len(texts)} sent)"
+            )
+        return vectors
     
-    async def store(
+    def _memory_id(self, content: str) -> str:
+        """
+        Deterministic ID for a memory: the same agent storing the same content
+        always gets the same point, so retries and re-imports find the
+        existing memory instead of duplicating it.
+        """
+        return str(uuid5(MEMORY_ID_NAMESPACE, f"{self.agent_id}:{content_key(content)}"))
+    
+    def _build_point(
         self,
+        memory_id: str,
+        vector: list[float],
         content: str,
         memory_type: str = "semantic",
         importance: float = 0.7,
         entities: Optional[list[str]] = None,
         session_id: Optional[str] = None,
         metadata: Optional[dict] = None,
-    ) -> str:
-        """Store a memory with embedding."""
-        memory_id = str(uuid4())
-        vector = await self._embed(content)
-        
+    ) -> dict:
+        """Build a Qdrant point with the full memory payload."""
         now = datetime.utcnow().isoformat()
-        point = {
+        return {
             "id": memory_id,
             "vector": vector,
             "payload": {
@@ -97,26 +292,186 @@ class MemoryClient:
                 "colbert_token_count": 0,
             }
         }
-        
+    
+    async def _get_points(self, ids: list[str], with_payload: bool = False) -> list[dict]:
+        """Retrieve whichever of the given points exist, in one request."""
+        if not ids:
+            return []
+        async with self.session.post(
+            f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points",
+            json={"ids": ids, "with_payload": with_payload, "with_vector": False},
+            headers={"Content-Type": "application/json"}
+        ) as resp:
+            resp.raise_for_status()
+            return json_loads(await resp.read()).get("result", [])
+    
+    async def _upsert(self, points: list[dict]) -> None:
+        """Upsert a batch of points in a single request."""
+        if not points:
+            return
+        # New memories can change any cached search result
+        self._qcache.clear()
         async with self.session.put(
             f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points",
-            json={"points": [point]},
+            json={"points": points},
             headers={"Content-Type": "application/json"}
         ) as resp:
-            await resp.json()
+            resp.raise_for_status()
+            await resp.read()
+        record_write()
+    
+    async def store(
+        self,
+        content: str,
+        memory_type: str = "semantic",
+        importance: float = 0.7,
+        entities: Optional[list[str]] = None,
+        session_id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> str:
+        """
+        Store a memory with embedding. Content this agent already stored is
+        left as is: its point carries importance and consolidation state
+        learned since, which a fresh payload would reset.
+        """
+        memory_id = self._memory_id(content)
+        if await self._get_points([memory_id]):
+            return memory_id
+        vector = await self._embed(content)
+        
+        await self._upsert([self._build_point(
+            memory_id,
+            vector,
+            content,
+            memory_type=memory_type,
+            importance=importance,
+            entities=entities,
+            session_id=session_id,
+            metadata=metadata,
+        )])
         
         return memory_id
     
-    async def search(
+    async def update(
+        self,
+        memory_id: str,
+        content: str,
+        metadata: Optional[dict] = None,
+    ) -> Optional[str]:
+        """
+        Replace a stored memory's content, keeping the rest of its payload
+        (importance tracking, consolidation state, timestamp). The point is
+        re-keyed to the ID of the new content, so storing that content later
+        finds it instead of duplicating it. Returns the memory's new ID, or
+        None if memory_id no longer exists.
+        """
+        new_id = self._memory_id(content)
+        points = {
+            p["id"]: p
+            for p in await self._get_points(list({memory_id, new_id}), with_payload=True)
+        }
+        if memory_id not in points:
+            return None
+        
+        if new_id != memory_id and new_id in points:
+            # The new content is already stored on its own; drop the stale copy
+            operations = [{"delete": {"points": [memory_id]}}]
+        else:
+            payload = points[memory_id]["payload"]
+            payload["content"] = content
+            if metadata is not None:
+                payload["metadata"] = metadata
+            vector = await self._embed(content)
+            operations = [
+                {"upsert": {"points": [{"id": new_id, "vector": vector, "payload": payload}]}}
+            ]
+            if new_id != memory_id:
+                operations.append({"delete": {"points": [memory_id]}})
+        
+        # Changed content can change any cached search result
+        self._qcache.clear()
+        async with self.session.post(
+            f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points/batch",
+            json={"operations": operations},
+            headers={"Content-Type": "application/json"}
+        ) as resp:
+            resp.raise_for_status()
+            await resp.read()
+        record_write()
+        return new_id
+    
+    async def store_many(
+        self,
+        memories: list[dict],
+        batch_size: int = STORE_BATCH_SIZE,
+    ) -> list[str]:
+        """
+        Store many memories, each a dict of store() keyword arguments.
+        Memories already stored are skipped, as in store().
+        
+        Runs as a pipeline: up to STORE_CONCURRENCY embedders turn batches
+        into points while a single writer upserts finished batches, so
+        embedding the next batch overlaps with writing the previous one.
+        """
+        memory_ids = [self._memory_id(m["content"]) for m in memories]
+        starts = iter(range(0, len(memories), batch_size))
+        n_embedders = min(STORE_CONCURRENCY, -(-len(memories) // batch_size))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STORE_PIPELINE_DEPTH)
+        
+        tasks = [
+            asyncio.create_task(
+                self._embed_batches(starts, batch_size, memory_ids, memories, queue)
+            )
+            for _ in range(n_embedders)
+        ]
+        tasks.append(asyncio.create_task(self._upsert_batches(queue, n_embedders)))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return memory_ids
+    
+    async def _embed_batches(
+        self,
+        starts,
+        batch_size: int,
+        memory_ids: list[str],
+        memories: list[dict],
+        queue: asyncio.Queue,
+    ) -> None:
+        """store_many() producer: embed batches and queue their points."""
+        # Embedders share one iterator of batch offsets
+        for i in starts:
+            batch = list(zip(memory_ids[i:i + batch_size], memories[i:i + batch_size]))
+            # Already-stored memories keep their points (see store())
+            existing = {p["id"] for p in await self._get_points([mid for mid, _ in batch])}
+            batch = [(mid, memory) for mid, memory in batch if mid not in existing]
+            if not batch:
+                continue
+            vectors = await self._embed_many([memory["content"] for _, memory in batch])
+            await queue.put([
+                self._build_point(memory_id, vector, **memory)
+                for (memory_id, memory), vector in zip(batch, vectors)
+            ])
+        await queue.put(None)
+    
+    async def _upsert_batches(self, queue: asyncio.Queue, n_embedders: int) -> None:
+        """store_many() consumer: upsert queued batches until every embedder is done."""
+        while n_embedders:
+            points = await queue.get()
+            if points is None:
+                n_embedders -= 1
+            else:
+                await self._upsert(points)
+    
+    def _search_filter(
         self,
-        query: str,
-        limit: int = 5,
         memory_types: Optional[list[str]] = None,
         min_importance: float = 0.0,
-    ) -> list[dict]:
-        """Search memories semantically."""
-        vector = await self._embed(query)
-        
+    ) -> dict:
+        """Build the payload filter shared by search requests."""
         must_conditions = [
             {"key": "agent_id", "match": {"value": self.agent_id}}
         ]
@@ -133,28 +488,114 @@ class MemoryClient:
                 "range": {"gte": min_importance}
             })
         
+        return {"must": must_conditions}
+    
+    @staticmethod
+    def _format_hit(r: dict) -> dict:
+        """Flatten a scored Qdrant point into a result dict."""
+        return {
+            "score": r["score"],
+            "content": r["payload"]["content"],
+            "memory_type": r["payload"].get("memory_type", "semantic"),
+            "importance": r["payload"].get("importance", 0.7),
+            "entities": r["payload"].get("entities", []),
+            "timestamp": r["payload"].get("timestamp", ""),
+        }
+    
+    async def search(
+        self,
+        query: str,
+        limit: int = 5,
+        memory_types: Optional[list[str]] = None,
+        min_importance: float = 0.0,
+    ) -> list[dict]:
+        """Search memories semantically."""
+        vector = await self._embed(query)
+        
+        cache_key = (limit, tuple(memory_types or ()), min_importance)
+        unit = np.asarray(vector, dtype=np.float32)
+        unit /= np.linalg.norm(unit) or 1.0
+        if self.use_cache:
+            cached = self._semantic_cache_get(cache_key, unit)
+            if cached is not None:
+                return cached
+        
         async with self.session.post(
             f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points/search",
             json={
                 "vector": vector,
                 "limit": limit,
                 "with_payload": True,
-                "filter": {"must": must_conditions}
+                "params": SEARCH_PARAMS,
+                "filter": self._search_filter(memory_types, min_importance)
+            },
+            headers={"Content-Type": "application/json"}
+        ) as resp:
+            data = json_loads(await resp.read())
+        
+        results = [self._format_hit(r) for r in data.get("result", [])]
+        if self.use_cache:
+            self._semantic_cache_put(cache_key, unit, results)
+        return results
+    
+    def _semantic_cache_get(self, key: tuple, unit: np.ndarray) -> Optional[list[dict]]:
+        """Return results of a near-duplicate earlier query with the same filters."""
+        entry = self._qcache.get(key)
+        if not entry:
+            return None
+        if entry["matrix"] is None:
+            entry["matrix"] = np.stack(entry["vectors"])
+        sims = entry["matrix"] @ unit
+        best = int(np.argmax(sims))
+        if sims[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        # Copies, since callers annotate result dicts in place
+        return [dict(r) for r in entry["results"][best]]
+    
+    def _semantic_cache_put(self, key: tuple, unit: np.ndarray, results: list[dict]) -> None:
+        """Remember a query's results, evicting the oldest entry when full."""
+        entry = self._qcache.setdefault(key, {"vectors": [], "results": [], "matrix": None})
+        if len(entry["vectors"]) >= SEMANTIC_CACHE_SIZE:
+            del entry["vectors"][0]
+            del entry["results"][0]
+        entry["vectors"].append(unit)
+        entry["results"].append([dict(r) for r in results])
+        entry["matrix"] = None
+    
+    async def search_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        memory_types: Optional[list[str]] = None,
+        min_importance: float = 0.0,
+    ) -> list[list[dict]]:
+        """Search several queries with one embedding call and one batch search."""
+        if not queries:
+            return []
+        vectors = await self._embed_many(queries)
+        search_filter = self._search_filter(memory_types, min_importance)
+        
+        async with self.session.post(
+            f"{QDRANT_URL}/collections/{COLLECTION_NAME}/points/search/batch",
+            json={
+                "searches": [
+                    {
+                        "vector": vector,
+                        "limit": limit,
+                        "with_payload": True,
+                        "params": SEARCH_PARAMS,
+                        "filter": search_filter,
+                    }
+                    for vector in vectors
+                ]
             },
             headers={"Content-Type": "application/json"}
         ) as resp:
-            data = await resp.json()
+            data = json_loads(await resp.read())
         
         return [
-            {
-                "score": r["score"],
-                "content": r["payload"]["content"],
-                "memory_type": r["payload"].get("memory_type", "semantic"),
-                "importance": r["payload"].get("importance", 0.7),
-                "entities": r["payload"].get("entities", []),
-                "timestamp": r["payload"].get("timestamp", ""),
-            }
-            for r in data.get("result", [])
+            [self._format_hit(r) for r in hits]
+            for hits in data.get("result", [])
         ]
     
     async def get_recent(
@@ -186,7 +627,7 @@ class MemoryClient:
             },
             headers={"Content-Type": "application/json"}
         ) as resp:
-            data = await resp.json()
+            data = json_loads(await resp.read())
         
         return [
             {
@@ -224,7 +665,7 @@ class MemoryClient:
             },
             headers={"Content-Type": "application/json"}
         ) as resp:
-            data = await resp.json()
+            data = json_loads(await resp.read())
         
         return [
             {
@@ -244,35 +685,63 @@ class MemoryClient:
         
         # Split by headers or paragraphs
         sections = []
-        current_section = ""
+        current_lines: list[str] = []
         current_header = ""
         
-        for line in content.split("\n"):
+        for line in content.splitlines():
             if line.startswith("## "):
-                if current_section.strip():
-                    sections.append((current_header, current_section.strip()))
+                text = "\n".join(current_lines).strip()
+                if text:
+                    sections.append((current_header, text))
                 current_header = line[3:].strip()
-                current_section = ""
+                current_lines = []
             else:
-                current_section += line + "\n"
+                current_lines.append(line)
         
-        if current_section.strip():
-            sections.append((current_header, current_section.strip()))
+        text = "\n".join(current_lines).strip()
+        if text:
+            sections.append((current_header, text))
         
-        count = 0
+        memories = []
         for header, text in sections:
             if len(text) > 50:  # Skip very short sections
                 entities = [header.lower().replace(" ", "-")] if header else []
-                await self.store(
-                    content=f"{header}: {text}" if header else text,
-                    memory_type="semantic",
-                    importance=0.7,
-                    entities=entities,
-                    metadata={"source": filepath, "header": header}
-                )
-                count += 1
+                memories.append({
+                    "content": f"{header}: {text}" if header else text,
+                    "memory_type": "semantic",
+                    "importance": 0.7,
+                    "entities": entities,
+                    "metadata": {"source": filepath, "header": header},
+                })
+        
+        await self.store_many(memories)
+        return len(memories)
+    
+    async def init_collection(self) -> None:
+        """
+        Prepare the collection for search: enable int8 scalar quantization
+        and create the payload indexes the search paths rely on. Safe to re-run.
+        """
+        async with self.session.patch(
+            f"{QDRANT_URL}/collections/{COLLECTION_NAME}",
+            json={
+                "quantization_config": {
+                    "scalar": {"type": "int8", "quantile": 0.99, "always_ram": True}
+                }
+            },
+            headers={"Content-Type": "application/json"}
+        ) as resp:
+            resp.raise_for_status()
+            await resp.read()
         
-        return count
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            async with self.session.put(
+                f"{QDRANT_URL}/collections/{COLLECTION_NAME}/index",
+                json={"field_name": field_name, "field_schema": field_schema},
+                headers={"Content-Type": "application/json"}
+            ) as resp:
+                resp.raise_for_status()
+                await resp.read()
     
     async def count(self) -> int:
         """Count memories for this agent."""
@@ -285,7 +754,7 @@ class MemoryClient:
             },
             headers={"Content-Type": "application/json"}
         ) as resp:
-            data = await resp.json()
+            data = json_loads(await resp.read())
         
         return data.get("result", {}).get("count", 0)
 
@@ -324,9 +793,17 @@ async def main():
     # Count command
     subparsers.add_parser("count", help="Count memories")
     
+    # Init command
+    subparsers.add_parser(
+        "init",
+        help="Enable int8 quantization (triggers an index rebuild) and create payload indexes",
+    )
+    
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the embedding cache")
+    
     args = parser.parse_args()
     
-    async with MemoryClient() as client:
+    async with MemoryClient(use_cache=not args.no_cache) as client:
         if args.command == "store":
             entities = args.entities.split(",") if args.entities else None
             mid = await client.store(
@@ -366,7 +843,11 @@ async def main():
         elif args.command == "count":
             count = await client.count()
             print(f"Total memories: {count}")
+        
+        elif args.command == "init":
+            await client.init_collection()
+            print(f"Indexes ready on {COLLECTION_NAME}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -8,36 +8,391 @@ import argparse
 import hashlib
 import json
 import os
+import re
 import sys
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from memory_client import MemoryClient
+from memory_client import (
+    MemoryClient,
+    QDRANT_URL,
+    COLLECTION_NAME,
+    json_dumps,
+    json_loads,
+    last_write_time,
+    orjson,
+    run_async,
+)
+import numpy as np  # installed on demand by memory_client
+
+_HEADER_RE = re.compile(r'(?m)^## (.*)$')
+_TITLE_RE = re.compile(r'(?m)^# .*\n?')
+_FENCE_RE = re.compile(r'(?m)^ {0,3}(`{3,}|~{3,})(.*)$')
+_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\S*')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Flattens memory content onto one export line in a single pass
+_NL_TBL = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+# Compact the sync state journal once it exceeds this fraction of the base file
+SYNC_LOG_COMPACT_RATIO = 0.25
+
+# Exports smaller than this (in characters) are written with a single syscall
+EXPORT_SINGLE_WRITE_MAX = 1 << 20
+
+# Exported memories whose 64-bit SimHashes differ in at most this many bits
+# are treated as duplicates (the index below relies on it being 3)
+SIMHASH_MAX_DISTANCE = 3
+
+# Export fetches are reused across runs for EXPORT_CACHE_TTL seconds
+EXPORT_CACHE_PATH = os.getenv(
+    "EXPORT_CACHE_PATH", os.path.expanduser("~/.cache/m2-memory/export_cache.json")
+)
+EXPORT_CACHE_TTL = int(os.getenv("EXPORT_CACHE_TTL", "3600"))
+
+# Max memory-client calls in flight across all phases of a sync
+MEMORY_SYNC_CONCURRENCY = int(os.getenv("MEMORY_SYNC_CONCURRENCY", "16"))
+_client_slots = None
+
+
+def client_slots() -> asyncio.Semaphore:
+    """Semaphore shared by every memory-client call made while syncing."""
+    global _client_slots
+    if _client_slots is None:
+        # Created lazily so it binds to the running event loop
+        _client_slots = asyncio.Semaphore(MEMORY_SYNC_CONCURRENCY)
+    return _client_slots
+
+
+@dataclass(slots=True)
+class Section:
+    """A `## ` section of a markdown file."""
+    header: str
+    content: str
+
+
+@dataclass(slots=True)
+class Memory:
+    """The fields of a stored memory that the export uses."""
+    content: str
+    memory_type: str
+    importance: float = 0
+    entities: list[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_row(cls, row: dict) -> "Memory":
+        return cls(
+            row["content"],
+            row["memory_type"],
+            row.get("importance", 0),
+            row.get("entities", []),
+        )
 
 
 def content_hash(text: str) -> str:
-    """Generate hash for content deduplication."""
+    """Generate hash for content deduplication (12 hex chars)."""
+    return hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
+
+
+def content_hashes(texts: list[str]) -> list[str]:
+    """content_hash() for many texts in one pass."""
+    return list(map(content_hash, texts))
+
+
+def legacy_content_hash(text: str) -> str:
+    """MD5-based hash used as sync-state key before the switch to BLAKE2b."""
     return hashlib.md5(text.encode()).hexdigest()[:12]
 
 
+def normalize(text: str) -> str:
+    """Drop ISO timestamps and collapse whitespace, for duplicate detection."""
+    return _WHITESPACE_RE.sub(" ", _TIMESTAMP_RE.sub("", text)).strip().lower()
+
+
+def simhashes(texts: list[str]) -> list[int]:
+    """64-bit SimHash of each text's normalized word bigrams."""
+    blake2b = hashlib.blake2b
+    result = []
+    for text in texts:
+        words = normalize(text).split()
+        features = [f"{a} {b}" for a, b in zip(words, words[1:])] or words
+        if not features:
+            result.append(0)
+            continue
+        digests = b"".join(blake2b(f.encode(), digest_size=8).digest() for f in features)
+        bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, 64)
+        votes = bits.sum(axis=0) * 2 > len(features)
+        result.append(int.from_bytes(np.packbits(votes).tobytes(), "big"))
+    return result
+
+
+class NearDuplicateIndex:
+    """
+    Set of SimHashes answering "is there one within SIMHASH_MAX_DISTANCE
+    bits?". Hashes are bucketed by four 16-bit bands; two hashes at most
+    3 bits apart always agree on at least one band.
+    """
+    
+    def __init__(self):
+        self.bands = [{} for _ in range(4)]
+        self.size = 0
+    
+    def add(self, h: int) -> bool:
+        """Add h unless a near-duplicate is present; True if added."""
+        keys = [(h >> (16 * i)) & 0xFFFF for i in range(4)]
+        for band, key in zip(self.bands, keys):
+            for other in band.get(key, ()):
+                if bin(h ^ other).count("1") <= SIMHASH_MAX_DISTANCE:
+                    return False
+        for band, key in zip(self.bands, keys):
+            band.setdefault(key, []).append(h)
+        self.size += 1
+        return True
+
+
+def load_sync_state(path: str) -> dict:
+    """Read the sync state: the base snapshot plus any journaled changes."""
+    sync_state = {}
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            sync_state = json_loads(f.read())
+    
+    log_path = f"{path}.log"
+    if os.path.exists(log_path):
+        with open(log_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    continue  # Torn write from an interrupted run
+                if record["value"] is None:
+                    sync_state.pop(record["key"], None)
+                else:
+                    sync_state[record["key"]] = record["value"]
+    
+    return sync_state
+
+
+def save_sync_state(path: str, sync_state: dict) -> None:
+    """Atomically rewrite the base sync state file (orjson when available)."""
+    tmp_path = f"{path}.tmp"
+    if orjson is not None:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(sync_state, option=orjson.OPT_INDENT_2))
+            os.fsync(f.fileno())
+    else:
+        with open(tmp_path, "w") as f:
+            json.dump(sync_state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def record_sync_changes(path: str, sync_state: dict, changes: dict) -> None:
+    """
+    Append changed entries (None = removed) to the sync state journal, and
+    compact the journal into the base file once it outgrows a quarter of it.
+    """
+    if not changes:
+        return
+    
+    log_path = f"{path}.log"
+    with open(log_path, "ab") as f:
+        if f.tell():
+            f.write(b"\n")  # Never extend a torn line left by an interrupted run
+        f.write(b"".join(
+            json_dumps({"key": key, "value": value}).encode() + b"\n"
+            for key, value in changes.items()
+        ))
+    
+    base_size = os.path.getsize(path) if os.path.exists(path) else 0
+    if os.path.getsize(log_path) > SYNC_LOG_COMPACT_RATIO * base_size:
+        save_sync_state(path, sync_state)
+        # Replaying a leftover journal onto the new base is harmless
+        os.remove(log_path)
+
+
+def write_export(path: str, parts: list[str]) -> None:
+    """
+    Write export text: small exports go out as one pre-encoded payload on an
+    unbuffered file, large ones are streamed through a big write buffer.
+    Either way the text lands in a temp file that atomically replaces path,
+    so a crash never leaves a truncated export behind.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        if sum(map(len, parts)) < EXPORT_SINGLE_WRITE_MAX:
+            with open(tmp_path, "wb", buffering=0) as f:
+                f.write("".join(parts).encode("utf-8"))
+                os.fsync(f.fileno())
+        else:
+            with open(tmp_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.writelines(parts)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_export_cache() -> dict:
+    """
+    Read export cache entries ({key: {"at", "rows"}}) that are unexpired and
+    were fetched after the last write through MemoryClient.
+    """
+    try:
+        with open(EXPORT_CACHE_PATH, "rb") as f:
+            cache = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    expired = time.time() - EXPORT_CACHE_TTL
+    last_write = last_write_time()
+    return {
+        k: v for k, v in cache.items()
+        if v["at"] >= expired and v["at"] > last_write
+    }
+
+
+def save_export_cache(cache: dict) -> None:
+    """Atomically write the export cache."""
+    os.makedirs(os.path.dirname(EXPORT_CACHE_PATH), exist_ok=True)
+    tmp_path = f"{EXPORT_CACHE_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(json_dumps(cache))
+    os.replace(tmp_path, EXPORT_CACHE_PATH)
+
+
+def fenced_spans(content: str) -> list[tuple[int, int]]:
+    """
+    (start, end) offsets of fenced code blocks, per CommonMark: a fence is
+    closed by a bare fence of the same character at least as long, and an
+    unclosed fence runs to the end of the document.
+    """
+    spans = []
+    opening = None
+    for match in _FENCE_RE.finditer(content):
+        fence, rest = match.groups()
+        if opening is None:
+            # A backtick fence's info string can't contain backticks
+            if fence[0] != "`" or "`" not in rest:
+                opening = match
+        elif (
+            fence[0] == opening.group(1)[0]
+            and len(fence) >= len(opening.group(1))
+            and not rest.strip()
+        ):
+            spans.append((opening.start(), match.end()))
+            opening = None
+    if opening is not None:
+        spans.append((opening.start(), len(content)))
+    return spans
+
+
+def parse_sections(content: str) -> list[Section]:
+    """
+    Split markdown into `## ` sections (text before the first header gets an
+    empty header), dropping `# ` title lines. Header and title positions come
+    from regex scans that skip lines inside fenced code blocks; bodies are
+    sliced out of the original string.
+    """
+    fences = fenced_spans(content)
+    fence_starts = [start for start, _ in fences]
+    
+    def in_fence(pos: int) -> bool:
+        i = bisect_right(fence_starts, pos) - 1
+        return i >= 0 and pos < fences[i][1]
+    
+    def body(start: int, end: int) -> str:
+        """content[start:end] without title lines outside code blocks."""
+        if not fences:
+            return _TITLE_RE.sub("", content[start:end]).strip()
+        pieces = []
+        pos = start
+        for title in _TITLE_RE.finditer(content, start, end):
+            if not in_fence(title.start()):
+                pieces.append(content[pos:title.start()])
+                pos = title.end()
+        pieces.append(content[pos:end])
+        return "".join(pieces).strip()
+    
+    sections = []
+    header = ""
+    body_start = 0
+    
+    for match in _HEADER_RE.finditer(content):
+        if in_fence(match.start()):
+            continue  # Inside a code block
+        
+        text = body(body_start, match.start())
+        if text:
+            sections.append(Section(header, text))
+        header = match.group(1).strip()
+        body_start = match.end()
+    
+    text = body(body_start, len(content))
+    if text:
+        sections.append(Section(header, text))
+    
+    return sections
+
+
 async def export_to_markdown(
     output_path: str,
     min_importance: float = 0.5,
     memory_types: list[str] = None,
+    client: MemoryClient = None,
+    use_cache: bool = True,
 ) -> int:
     """Export vector memories to markdown file."""
-    async with MemoryClient() as client:
-        # Get high-importance semantic memories using generic query
-        semantic = await client.search(
-            "important facts knowledge preferences",  # Generic query
-            limit=100,
-            memory_types=["semantic"] if not memory_types else memory_types,
-            min_importance=min_importance,
-        )
-        
-        # Also get recent episodic memories
-        episodic = await client.get_recent(hours=168, limit=50)  # Last week
+    if client is None:
+        async with MemoryClient() as client:
+            return await export_to_markdown(
+                output_path, min_importance, memory_types, client, use_cache
+            )
+    
+    cache = await asyncio.to_thread(load_export_cache) if use_cache else {}
+    cache_misses = 0
+    
+    async def cached(key: list, fetch):
+        nonlocal cache_misses
+        key = json_dumps([QDRANT_URL, COLLECTION_NAME, client.agent_id, *key])
+        if key in cache:
+            return cache[key]["rows"]
+        # Stamped before fetching, so a write racing the fetch invalidates it
+        fetched_at = time.time()
+        async with client_slots():
+            rows = await fetch()
+        cache[key] = {"at": fetched_at, "rows": rows}
+        cache_misses += 1
+        return rows
+    
+    query = "important facts knowledge preferences"  # Generic query
+    types = ["semantic"] if not memory_types else memory_types
+    
+    # High-importance semantic memories (generic query) and recent
+    # episodic memories are independent, so fetch them concurrently
+    semantic, episodic = await asyncio.gather(
+        cached(
+            ["search", query, 100, types, min_importance],
+            lambda: client.search(
+                query, limit=100, memory_types=types, min_importance=min_importance
+            ),
+        ),
+        cached(
+            ["recent", 168, 50],
+            lambda: client.get_recent(hours=168, limit=50),  # Last week
+        ),
+    )
+    if use_cache and cache_misses:
+        await asyncio.to_thread(save_export_cache, cache)
+    cache.clear()  # Only the rows below are needed from here on
     
     # Organize by type
     organized = {
@@ -45,116 +400,185 @@ async def export_to_markdown(
         "Recent Conversations": [],
     }
     
-    seen_hashes = set()
+    # Collapse near-duplicates (differing only in timestamps, whitespace
+    # or a word or two), keeping the first occurrence
+    seen = NearDuplicateIndex()
     
-    for mem in semantic:
-        h = content_hash(mem["content"])
-        if h not in seen_hashes:
-            seen_hashes.add(h)
+    semantic = [Memory.from_row(row) for row in semantic]
+    for mem, h in zip(semantic, simhashes([m.content for m in semantic])):
+        if seen.add(h):
             organized["Semantic Knowledge"].append(mem)
     
-    for mem in episodic:
-        if mem["memory_type"] == "episodic":
-            h = content_hash(mem["content"])
-            if h not in seen_hashes:
-                seen_hashes.add(h)
-                organized["Recent Conversations"].append(mem)
-    
-    # Generate markdown
-    lines = [
-        "# Memory Export",
-        f"*Exported: {datetime.utcnow().isoformat()}*",
-        f"*Min importance: {min_importance}*",
-        "",
+    episodic = [
+        Memory.from_row(row) for row in episodic if row["memory_type"] == "episodic"
+    ]
+    for mem, h in zip(episodic, simhashes([m.content for m in episodic])):
+        if seen.add(h):
+            organized["Recent Conversations"].append(mem)
+    
+    # Release everything but the kept memories before formatting
+    count = seen.size
+    del seen, semantic, episodic
+    
+    parts = [
+        "# Memory Export\n",
+        f"*Exported: {datetime.utcnow().isoformat()}*\n",
+        f"*Min importance: {min_importance}*\n",
     ]
     
+    # Hot loop: bind lookups to locals, one f-string per memory
+    append = parts.append
+    join = ", ".join
+    translate = str.translate
+    table = _NL_TBL
+    
     for section, memories in organized.items():
         if memories:
-            lines.append(f"## {section}")
-            lines.append("")
+            append(f"\n## {section}\n\n")
             for mem in memories:
-                importance = mem.get("importance", 0)
-                entities = mem.get("entities", [])
-                content = mem["content"].replace("\n", " ").strip()
-                
-                lines.append(f"- **[{importance:.1f}]** {content[:200]}")
-                if entities:
-                    lines.append(f"  - *Tags: {', '.join(entities[:5])}*")
-            lines.append("")
+                entities = mem.entities
+                append(
+                    f"- **[{mem.importance:.1f}]** "
+                    f"{translate(mem.content, table).strip()[:200]}\n"
+                    + (f"  - *Tags: {join(entities[:5])}*\n" if entities else "")
+                )
+            memories.clear()  # Formatted; let the records go
     
-    # Write file
-    with open(output_path, "w") as f:
-        f.write("\n".join(lines))
+    await asyncio.to_thread(write_export, output_path, parts)
     
-    return len(seen_hashes)
+    return count
 
 
 async def sync_from_markdown(
     filepath: str,
     sync_state_path: str = None,
+    client: MemoryClient = None,
 ) -> dict:
     """
     Import from markdown, tracking what's already synced.
     Returns stats on new/updated/skipped.
     """
-    # Load sync state
-    sync_state = {}
-    if sync_state_path and os.path.exists(sync_state_path):
-        with open(sync_state_path) as f:
-            sync_state = json.load(f)
-    
-    # Read markdown
-    with open(filepath) as f:
-        content = f.read()
+    # Load sync state and read markdown off the event loop
+    sync_state = (
+        await asyncio.to_thread(load_sync_state, sync_state_path)
+        if sync_state_path else {}
+    )
+    changes = {}
     
-    # Parse sections
-    sections = []
-    current = {"header": "", "content": ""}
+    data = await asyncio.to_thread(Path(filepath).read_bytes)
     
-    for line in content.split("\n"):
-        if line.startswith("## "):
-            if current["content"].strip():
-                sections.append(current)
-            current = {"header": line[3:].strip(), "content": ""}
-        elif not line.startswith("# "):  # Skip title
-            current["content"] += line + "\n"
+    # An unchanged file has nothing new to sync
+    file_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if sync_state.get("_file_hash") == file_hash:
+        return {"new": 0, "skipped": sync_state.get("_file_sections", 0), "updated": 0}
     
-    if current["content"].strip():
-        sections.append(current)
+    # Section hashes are computed on universal-newline text, as read_text()
+    # produced before, so CRLF files keep matching their sync state
+    sections = parse_sections(
+        data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    )
     
     stats = {"new": 0, "skipped": 0, "updated": 0}
     
-    async with MemoryClient() as client:
-        for section in sections:
-            text = section["content"].strip()
-            if len(text) < 30:
-                continue
-            
-            h = content_hash(text)
-            
-            if h in sync_state:
-                stats["skipped"] += 1
-                continue
-            
-            # Store new memory
-            await client.store(
-                content=f"{section['header']}: {text}" if section['header'] else text,
-                memory_type="semantic",
-                importance=0.7,
-                entities=[section['header'].lower().replace(" ", "-")] if section['header'] else [],
-                metadata={"source": filepath, "synced_at": datetime.utcnow().isoformat()}
-            )
-            
-            sync_state[h] = {
-                "header": section["header"],
-                "synced_at": datetime.utcnow().isoformat()
-            }
+    texts = [section.content for section in sections]
+    hashes = content_hashes(texts)
+    
+    # A synced entry that no longer appears in the file, and is the only
+    # such entry under its header, was edited: a section with that header
+    # and unknown content updates its memory in place
+    present = set(hashes)
+    by_header = {}
+    for key, entry in sync_state.items():
+        if key.startswith("_") or key in present:
+            continue
+        if entry.get("memory_id") and entry["header"]:
+            header = entry["header"]
+            by_header[header] = None if header in by_header else key
+    
+    new_memories = []
+    new_hashes = []
+    updates = []
+    for section, text, h in zip(sections, texts, hashes):
+        if len(text) < 30:
+            continue
+        
+        # Re-key entries written by the MD5 version of content_hash
+        if h not in sync_state:
+            legacy = legacy_content_hash(text)
+            if legacy in sync_state:
+                sync_state[h] = changes[h] = sync_state.pop(legacy)
+                changes[legacy] = None
+        
+        if h in sync_state:
+            stats["skipped"] += 1
+            continue
+        
+        now = datetime.utcnow().isoformat()
+        memory = {
+            "content": f"{section.header}: {text}" if section.header else text,
+            "memory_type": "semantic",
+            "importance": 0.7,
+            "entities": [section.header.lower().replace(" ", "-")] if section.header else [],
+            "metadata": {"source": filepath, "synced_at": now},
+        }
+        entry = {"header": section.header, "synced_at": now}
+        
+        old = by_header.pop(section.header, None)
+        if old is not None:
+            updates.append((h, sync_state.pop(old)["memory_id"], memory))
+            changes[old] = None
+            stats["updated"] += 1
+        else:
+            new_memories.append(memory)
+            new_hashes.append(h)
             stats["new"] += 1
+        
+        sync_state[h] = changes[h] = entry
+    
+    async def write(client: MemoryClient) -> None:
+        async def store() -> list[str]:
+            async with client_slots():
+                return await client.store_many(new_memories)
+        
+        async def update(h: str, memory_id: str, memory: dict) -> None:
+            async with client_slots():
+                memory_id = await client.update(
+                    memory_id, memory["content"], metadata=memory["metadata"]
+                )
+            if memory_id is None:
+                # Deleted from the store since it was synced; store the edit afresh
+                async with client_slots():
+                    (memory_id,) = await client.store_many([memory])
+                stats["updated"] -= 1
+                stats["new"] += 1
+            # Updates re-key the memory to its new content's ID
+            sync_state[h]["memory_id"] = memory_id
+        
+        # New sections go out in batched requests, edits one update each
+        memory_ids, *_ = await asyncio.gather(
+            store(), *(update(*args) for args in updates)
+        )
+        for h, memory_id in zip(new_hashes, memory_ids):
+            sync_state[h]["memory_id"] = memory_id
+    
+    if new_memories or updates:
+        if client is None:
+            async with MemoryClient() as client:
+                await write(client)
+        else:
+            await write(client)
     
-    # Save sync state
+    # Remember the file version so the next run can skip it outright
+    sync_state["_file_hash"] = changes["_file_hash"] = file_hash
+    sync_state["_file_sections"] = changes["_file_sections"] = (
+        stats["new"] + stats["skipped"] + stats["updated"]
+    )
+    
+    # Journal what changed instead of rewriting the whole state
     if sync_state_path:
-        with open(sync_state_path, "w") as f:
-            json.dump(sync_state, f, indent=2)
+        await asyncio.to_thread(
+            record_sync_changes, sync_state_path, sync_state, changes
+        )
     
     return stats
 
@@ -163,26 +587,35 @@ async def full_sync(
     markdown_path: str,
     export_path: str = None,
     sync_state_path: str = None,
+    use_cache: bool = True,
 ):
     """
     Full bidirectional sync:
     1. Import new content from markdown
     2. Export high-importance memories back
     """
-    print(f"📥 Importing from {markdown_path}...")
-    import_stats = await sync_from_markdown(
-        markdown_path,
-        sync_state_path or f"{markdown_path}.sync.json"
-    )
-    print(f"   New: {import_stats['new']}, Skipped: {import_stats['skipped']}")
-    
-    if export_path:
-        print(f"📤 Exporting to {export_path}...")
-        count = await export_to_markdown(export_path, min_importance=0.6)
-        print(f"   Exported {count} memories")
-    
+    # One client (and connection pool) serves every phase
     async with MemoryClient() as client:
-        total = await client.count()
+        print(f"📥 Importing from {markdown_path}...")
+        import_stats = await sync_from_markdown(
+            markdown_path,
+            sync_state_path or f"{markdown_path}.sync.json",
+            client=client,
+        )
+        print(
+            f"   New: {import_stats['new']}, Updated: {import_stats['updated']}, "
+            f"Skipped: {import_stats['skipped']}"
+        )
+        
+        if export_path:
+            print(f"📤 Exporting to {export_path}...")
+            count = await export_to_markdown(
+                export_path, min_importance=0.6, client=client, use_cache=use_cache
+            )
+            print(f"   Exported {count} memories")
+        
+        async with client_slots():
+            total = await client.count()
     print(f"📊 Total memories: {total}")
 
 
@@ -205,6 +638,8 @@ async def main():
     sync.add_argument("markdown", help="Main markdown file")
     sync.add_argument("--export", help="Export file path")
     
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the export result cache")
+    
     args = parser.parse_args()
     
     if args.command == "import":
@@ -212,12 +647,14 @@ async def main():
         print(f"Import stats: {stats}")
     
     elif args.command == "export":
-        count = await export_to_markdown(args.output, args.min_importance)
+        count = await export_to_markdown(
+            args.output, args.min_importance, use_cache=not args.no_cache
+        )
         print(f"Exported {count} memories to {args.output}")
     
     elif args.command == "sync":
-        await full_sync(args.markdown, args.export)
+        await full_sync(args.markdown, args.export, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())